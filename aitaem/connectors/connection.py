@@ -4,12 +4,13 @@ aitaem.connectors.connection - Connection manager for multiple backends
 Manages multiple backend connections and routes queries via URI parsing.
 """
 
+import functools
 import os
 import re
 import tempfile
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
-from urllib.parse import urlparse
 
 import ibis
 import yaml
@@ -23,6 +24,66 @@ from aitaem.utils.exceptions import (
     UnsupportedBackendError,
 )
 
+# Prefer the libyaml-backed loader; fall back when PyYAML was built without it
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader
+
+# Matches ${VAR_NAME} placeholders in connection config values
+_ENV_VAR_RE = re.compile(r"\$\{([^}]+)\}")
+
+# RFC 3986 scheme grammar, as accepted by urllib.parse for the backend type
+_URI_SCHEME_RE = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*")
+
+# Leading characters stripped, and characters removed anywhere, before parsing;
+# the same sets urllib.parse.urlsplit uses
+_URI_LEADING_STRIP = "".join(map(chr, range(0x21)))
+_URI_UNSAFE_CHARS = str.maketrans("", "", "\t\r\n")
+
+# Static format help appended to InvalidURIError messages, one block per backend
+_DUCKDB_URI_HELP = "\n\nDuckDB URI format:\n  duckdb://database.db/table_name"
+_BIGQUERY_URI_HELP = (
+    "\n\nValid formats:\n  bigquery://project.dataset.table\n  bigquery://project/dataset.table"
+)
+_POSTGRES_URI_HELP = (
+    "\n\nPostgres URI format:\n  postgres://public/events\n  postgres:///events  (default schema)"
+)
+
+# Registry: backend name → how a validated config maps onto IbisConnector.connect().
+# Keyed the same as BACKEND_SPECS; a new backend needs an entry in both.
+_CONNECT_ADAPTERS: dict[str, Callable[[IbisConnector, dict[str, Any]], None]] = {
+    "duckdb": lambda connector, config: connector.connect(config.pop("path"), **config),
+    "bigquery": lambda connector, config: connector.connect(**config),
+    "postgres": lambda connector, config: connector.connect(**config),
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _load_yaml_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a connections YAML file, memoized on (path, mtime, size).
+
+    mtime_ns and size are part of the key only so that an edited file misses
+    the cache. The result is shared between calls and must not be mutated. It
+    holds the raw ${VAR} placeholders; environment variables are substituted
+    after the lookup, so changes to the environment are always picked up.
+    """
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=_YAMLLoader)
+
+
+def _contains_placeholder(config: dict[str, Any]) -> bool:
+    """Return True if any string value in a nested config dict contains '${'."""
+    pending = [config]
+    while pending:
+        for value in pending.pop().values():
+            if type(value) is str:
+                if "${" in value:
+                    return True
+            elif type(value) is dict:
+                pending.append(value)
+    return False
+
 
 class ConnectionManager:
     """Manages multiple backend connections and routes queries.
@@ -50,6 +111,10 @@ class ConnectionManager:
                 add_connection() with an UnsupportedBackendError.
         """
         self._connections: dict[str, IbisConnector] = {}
+        # source URI → connector; only ever holds entries present in _connections
+        self._resolve_cache: dict[str, IbisConnector] = {}
+        # Rendered __repr__; reset whenever the set of backends changes
+        self._repr_cache: str | None = None
         self._tmp_dir = tmp_dir
         self._cross_backend_conn: ibis.BaseBackend | None = None
         self._cross_backend_db_path: str | None = None
@@ -81,8 +146,8 @@ class ConnectionManager:
             )
 
         try:
-            with open(yaml_file, "r") as f:
-                config = yaml.safe_load(f)
+            stat = yaml_file.stat()
+            config = _load_yaml_cached(str(yaml_file.resolve()), stat.st_mtime_ns, stat.st_size)
         except yaml.YAMLError as e:
             raise ConfigurationError(
                 f"Invalid YAML syntax in {yaml_path}:\n{str(e)}\n\n"
@@ -96,7 +161,7 @@ class ConnectionManager:
 
         # Process each backend configuration
         for backend_type, backend_config in config.items():
-            if not isinstance(backend_config, dict):
+            if type(backend_config) is not dict:
                 raise ConfigurationError(
                     f"Invalid configuration for backend '{backend_type}' in {yaml_path}\n"
                     "Expected a mapping (key-value pairs)."
@@ -107,9 +172,9 @@ class ConnectionManager:
 
             try:
                 manager.add_connection(backend_type, **substituted_config)
+            except (ConfigurationError, UnsupportedBackendError):
+                raise
             except Exception as e:
-                if isinstance(e, (ConfigurationError, UnsupportedBackendError)):
-                    raise
                 raise ConfigurationError(
                     f"Failed to create connection for backend '{backend_type}': {str(e)}"
                 ) from e
@@ -119,26 +184,42 @@ class ConnectionManager:
     def _substitute_env_vars_in_dict(
         self, config: dict[str, Any], yaml_path: str
     ) -> dict[str, Any]:
-        """Recursively substitute environment variables in config dictionary.
+        """Substitute environment variables in a (possibly nested) config dictionary.
+
+        Nested dicts are walked with an explicit stack rather than recursion, so
+        deeply nested configs neither allocate a frame per level nor hit the
+        interpreter's recursion limit. Values are dispatched on exact type
+        (``type(v) is str``): the safe YAML loader only produces plain
+        str/dict, never subclasses.
 
         Args:
             config: Configuration dictionary
             yaml_path: Path to YAML file (for error messages)
 
         Returns:
-            Dictionary with environment variables substituted
+            Dictionary with environment variables substituted. When no value in
+            the tree contains a ``${`` placeholder, ``config`` itself is returned
+            rather than a copy.
 
         Raises:
             ConfigurationError: If referenced environment variable is not set
         """
+        if not _contains_placeholder(config):
+            return config
+
         result: dict[str, Any] = {}
-        for key, value in config.items():
-            if isinstance(value, str):
-                result[key] = self._substitute_env_vars(value, yaml_path)
-            elif isinstance(value, dict):
-                result[key] = self._substitute_env_vars_in_dict(value, yaml_path)
-            else:
-                result[key] = value
+        stack: list[tuple[dict[str, Any], dict[str, Any]]] = [(config, result)]
+        while stack:
+            source, target = stack.pop()
+            for key, value in source.items():
+                if type(value) is str:
+                    target[key] = self._substitute_env_vars(value, yaml_path)
+                elif type(value) is dict:
+                    nested: dict[str, Any] = {}
+                    target[key] = nested
+                    stack.append((value, nested))
+                else:
+                    target[key] = value
         return result
 
     def _substitute_env_vars(self, value: str, yaml_path: str) -> str:
@@ -154,7 +235,9 @@ class ConnectionManager:
         Raises:
             ConfigurationError: If environment variable is not set
         """
-        pattern = r"\$\{([^}]+)\}"
+        # Most config values have no placeholder; skip the regex engine entirely
+        if "${" not in value:
+            return value
 
         def replace_var(match: re.Match) -> str:
             var_name = match.group(1)
@@ -167,7 +250,7 @@ class ConnectionManager:
                 )
             return var_value
 
-        return re.sub(pattern, replace_var, value)
+        return _ENV_VAR_RE.sub(replace_var, value)
 
     def add_connection(
         self, backend_type: str, connector: "IbisConnector | None" = None, **config: Any
@@ -197,6 +280,7 @@ class ConnectionManager:
 
         if connector is not None:
             self._connections[backend_type] = connector
+            self._repr_cache = None
             return
 
         # Validate required fields using backend spec (raises ConfigurationError if invalid)
@@ -209,16 +293,11 @@ class ConnectionManager:
             raise
 
         # Connect using appropriate method
-        if backend_type == "duckdb":
-            path = config.pop("path")
-            new_connector.connect(path, **config)
-        elif backend_type == "bigquery":
-            new_connector.connect(**config)
-        elif backend_type == "postgres":
-            new_connector.connect(**config)
+        _CONNECT_ADAPTERS[backend_type](new_connector, config)
 
         # Store connector
         self._connections[backend_type] = new_connector
+        self._repr_cache = None
 
     def get_connection(self, backend_type: str) -> IbisConnector:
         """Get connector by backend type.
@@ -232,7 +311,8 @@ class ConnectionManager:
         Raises:
             ConnectionNotFoundError: If backend not configured
         """
-        if backend_type not in self._connections:
+        connector = self._connections.get(backend_type)
+        if connector is None:
             raise ConnectionNotFoundError(
                 f"No connection configured for backend '{backend_type}'\n\n"
                 "Add the connection to your connections.yaml:\n"
@@ -241,7 +321,7 @@ class ConnectionManager:
                 "Or call add_connection():\n"
                 f"  manager.add_connection('{backend_type}', ...)"
             )
-        return self._connections[backend_type]
+        return connector
 
     def get_connection_for_source(self, source_uri: str) -> IbisConnector:
         """Parse URI and return appropriate connector.
@@ -256,15 +336,29 @@ class ConnectionManager:
             InvalidURIError: If URI is malformed
             ConnectionNotFoundError: If backend not configured
         """
+        connector = self._resolve_cache.get(source_uri)
+        if connector is not None:
+            return connector
         backend_type, _, _ = self.parse_source_uri(source_uri)
-        return self.get_connection(backend_type)
+        connector = self.get_connection(backend_type)
+        self._resolve_cache[source_uri] = connector
+        return connector
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def parse_source_uri(uri: str) -> tuple[str, str, str]:
         """Parse source URI into (backend, database, table).
 
         Format: backend://database_identifier/table_name
 
+        The backend type must be a valid URI scheme followed by '://'.
+        As with urllib.parse, leading control characters and spaces are
+        ignored, tab/CR/LF are removed anywhere, and any ?query or #fragment
+        is dropped.
+
+        Results are memoized per URI string (URIs are immutable, so the cache
+        never needs invalidating); malformed URIs are not cached.
+
         DuckDB Examples:
             - 'duckdb://analytics.db/events' → ('duckdb', 'analytics.db', 'events')
             - 'duckdb://:memory:/events' → ('duckdb', ':memory:', 'events')
@@ -283,42 +377,42 @@ class ConnectionManager:
         Raises:
             InvalidURIError: If URI is malformed
         """
-        # Parse URI
-        parsed = urlparse(uri)
-
-        # Extract backend type (scheme)
-        backend_type = parsed.scheme
-        if not backend_type:
+        # Split on the scheme separator; the grammar is too narrow to need urlparse,
+        # but leading whitespace, the scheme and ?query/#fragment are handled the same way
+        cleaned = uri.lstrip(_URI_LEADING_STRIP).translate(_URI_UNSAFE_CHARS)
+        scheme, sep, path = cleaned.partition("://")
+        if not sep or not _URI_SCHEME_RE.fullmatch(scheme):
             raise InvalidURIError(
                 f"Missing backend type in URI: '{uri}'\n\n"
                 "URI must start with backend type:\n"
                 "  duckdb://analytics.db/events\n"
                 "  bigquery://project.dataset.table"
             )
+        backend_type = scheme.lower()
 
-        # Combine netloc and path
-        full_path = parsed.netloc + parsed.path
+        # A query string or fragment is not part of the source location
+        path = path.partition("#")[0].partition("?")[0]
 
-        if not full_path:
+        if not path:
             raise InvalidURIError(
                 f"Empty path in URI: '{uri}'\n\nURI must include database and table."
             )
 
         # Backend-specific parsing
         if backend_type == "duckdb":
-            return ConnectionManager._parse_duckdb_uri(uri, full_path)
+            return ConnectionManager._parse_duckdb_uri(uri, path)
         elif backend_type == "bigquery":
-            return ConnectionManager._parse_bigquery_uri(uri, full_path)
+            return ConnectionManager._parse_bigquery_uri(uri, path)
         elif backend_type == "postgres":
-            return ConnectionManager._parse_postgres_uri(uri, full_path)
+            return ConnectionManager._parse_postgres_uri(uri, path)
         else:
             # For unknown backends, try generic parsing
             # This will fail later in get_connection with UnsupportedBackendError
-            if "/" not in full_path:
+            if "/" not in path:
                 raise InvalidURIError(f"Missing table separator '/' in URI: '{uri}'")
-            last_slash = full_path.rfind("/")
-            database = full_path[:last_slash]
-            table = full_path[last_slash + 1 :]
+            last_slash = path.rfind("/")
+            database = path[:last_slash]
+            table = path[last_slash + 1 :]
             if not table:
                 raise InvalidURIError(
                     f"Empty table name in URI: '{uri}'\n\nURI must include table name."
@@ -326,12 +420,12 @@ class ConnectionManager:
             return (backend_type, database, table)
 
     @staticmethod
-    def _parse_duckdb_uri(uri: str, full_path: str) -> tuple[str, str, str]:
+    def _parse_duckdb_uri(uri: str, path: str) -> tuple[str, str, str]:
         """Parse DuckDB URI.
 
         Args:
             uri: Original URI (for error messages)
-            full_path: Combined netloc + path
+            path: Everything after 'backend://'
 
         Returns:
             Tuple of ('duckdb', database_path, table_name)
@@ -339,17 +433,13 @@ class ConnectionManager:
         Raises:
             InvalidURIError: If URI is malformed
         """
-        if "/" not in full_path:
-            raise InvalidURIError(
-                f"Missing table separator '/' in URI: '{uri}'\n\n"
-                "DuckDB URI format:\n"
-                "  duckdb://database.db/table_name"
-            )
+        if "/" not in path:
+            raise InvalidURIError(f"Missing table separator '/' in URI: '{uri}'" + _DUCKDB_URI_HELP)
 
         # Find LAST '/' to separate database from table
-        last_slash = full_path.rfind("/")
-        database = full_path[:last_slash]
-        table = full_path[last_slash + 1 :]
+        last_slash = path.rfind("/")
+        database = path[:last_slash]
+        table = path[last_slash + 1 :]
 
         if not table:
             raise InvalidURIError(
@@ -361,12 +451,12 @@ class ConnectionManager:
         return ("duckdb", database, table)
 
     @staticmethod
-    def _parse_bigquery_uri(uri: str, full_path: str) -> tuple[str, str, str]:
+    def _parse_bigquery_uri(uri: str, path: str) -> tuple[str, str, str]:
         """Parse BigQuery URI.
 
         Args:
             uri: Original URI (for error messages)
-            full_path: Combined netloc + path
+            path: Everything after 'backend://'
 
         Returns:
             Tuple of ('bigquery', project_id, 'dataset.table')
@@ -374,35 +464,29 @@ class ConnectionManager:
         Raises:
             InvalidURIError: If URI is malformed or has <3 parts
         """
-        # Normalize: replace all '/' with '.'
-        normalized = full_path.replace("/", ".")
-
-        # Split on '.'
-        parts = normalized.split(".")
-
-        if len(parts) < 3:
+        # '/' and '.' are interchangeable separators; count them without splitting
+        if path.count(".") + path.count("/") < 2:
             raise InvalidURIError(
-                f"BigQuery URI must have at least 3 parts (project.dataset.table): '{uri}'\n\n"
-                "Valid formats:\n"
-                "  bigquery://project.dataset.table\n"
-                "  bigquery://project/dataset.table"
+                f"BigQuery URI must have at least 3 parts (project.dataset.table): '{uri}'"
+                + _BIGQUERY_URI_HELP
             )
 
         # Extract project (first part) and table (everything else as dataset.table)
-        project = parts[0]
-        table = ".".join(parts[1:])
+        first_sep = min(i for i in (path.find("."), path.find("/")) if i >= 0)
+        project = path[:first_sep]
+        table = path[first_sep + 1 :].replace("/", ".")
 
         return ("bigquery", project, table)
 
     @staticmethod
-    def _parse_postgres_uri(uri: str, full_path: str) -> tuple[str, str, str]:
+    def _parse_postgres_uri(uri: str, path: str) -> tuple[str, str, str]:
         """Parse Postgres URI.
 
         Format: postgres://schema/table  or  postgres:///table (no schema)
 
         Args:
             uri: Original URI (for error messages)
-            full_path: Combined netloc + path
+            path: Everything after 'backend://'
 
         Returns:
             Tuple of ('postgres', schema, table_name)
@@ -410,16 +494,13 @@ class ConnectionManager:
         Raises:
             InvalidURIError: If URI is malformed
         """
-        if "/" not in full_path:
+        if "/" not in path:
             raise InvalidURIError(
-                f"Missing table separator '/' in URI: '{uri}'\n\n"
-                "Postgres URI format:\n"
-                "  postgres://public/events\n"
-                "  postgres:///events  (default schema)"
+                f"Missing table separator '/' in URI: '{uri}'" + _POSTGRES_URI_HELP
             )
-        last_slash = full_path.rfind("/")
-        schema = full_path[:last_slash]
-        table = full_path[last_slash + 1 :]
+        last_slash = path.rfind("/")
+        schema = path[:last_slash]
+        table = path[last_slash + 1 :]
         if not table:
             raise InvalidURIError(
                 f"Empty table name in URI: '{uri}'\n\n"
@@ -458,6 +539,8 @@ class ConnectionManager:
         for connector in self._connections.values():
             connector.close()
         self._connections.clear()
+        self._resolve_cache.clear()
+        self._repr_cache = None
         if self._cross_backend_conn is not None:
             try:
                 self._cross_backend_conn.disconnect()
@@ -505,5 +588,6 @@ class ConnectionManager:
 
     def __repr__(self) -> str:
         """Return string representation of manager."""
-        backends = list(self._connections.keys())
-        return f"ConnectionManager(backends={backends})"
+        if self._repr_cache is None:
+            self._repr_cache = f"ConnectionManager(backends={list(self._connections)})"
+        return self._repr_cache
@@ -4,10 +4,9 @@ aitaem.connectors.ibis_connector - Ibis-based multi-backend connector
 Provides unified connector for DuckDB and BigQuery via Ibis abstraction layer.
 """
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import ibis
-import pandas as pd
 
 from aitaem.connectors.backend_specs import validate_backend_config
 from aitaem.utils.exceptions import (
@@ -19,11 +18,19 @@ from aitaem.utils.exceptions import (
     UnsupportedBackendError,
 )
 
-# Import ibis-specific exceptions
-try:
-    from ibis.common.exceptions import IbisError
-except ImportError:
-    IbisError = Exception
+if TYPE_CHECKING:
+    # Only needed for the execute() return annotation
+    import pandas as pd
+
+# Substrings (lowercased) that mark a backend error as "table not found"; matched
+# against the error message and the exception type name
+_NOT_FOUND_MARKERS = ("not found", "does not exist", "tablenotfound")
+
+
+def _is_table_not_found(error: Exception) -> bool:
+    """Return True if a backend exception means the requested table is missing."""
+    blob = f"{error}\0{type(error).__name__}".lower()
+    return any(marker in blob for marker in _NOT_FOUND_MARKERS)
 
 
 class IbisConnector:
@@ -34,7 +41,8 @@ class IbisConnector:
         connection: Ibis backend connection object
     """
 
-    SUPPORTED_BACKENDS = {"duckdb", "bigquery", "postgres"}
+    SUPPORTED_BACKENDS: frozenset[str] = frozenset({"duckdb", "bigquery", "postgres"})
+    _SUPPORTED_STR = ", ".join(sorted(SUPPORTED_BACKENDS))
 
     def __init__(self, backend_type: str):
         """Initialize connector for specified backend type.
@@ -48,7 +56,7 @@ class IbisConnector:
         if backend_type not in self.SUPPORTED_BACKENDS:
             raise UnsupportedBackendError(
                 f"Backend type '{backend_type}' not supported\n\n"
-                f"Supported backends: {', '.join(sorted(self.SUPPORTED_BACKENDS))}"
+                f"Supported backends: {self._SUPPORTED_STR}"
             )
 
         self.backend_type = backend_type
@@ -76,9 +84,9 @@ class IbisConnector:
                 self._connect_bigquery(**kwargs)
             elif self.backend_type == "postgres":
                 self._connect_postgres(**kwargs)
+        except (AitaemConnectionError, ConfigurationError, ValueError):
+            raise
         except Exception as e:
-            if isinstance(e, (AitaemConnectionError, ConfigurationError, ValueError)):
-                raise
             raise AitaemConnectionError(
                 f"Failed to connect to {self.backend_type}: {str(e)}"
             ) from e
@@ -196,28 +204,9 @@ class IbisConnector:
 
             assert self.connection is not None
             return self.connection.table(table_name)
-        except IbisError as e:
-            # Check if it's a table not found error
-            error_msg = str(e).lower()
-            error_type = type(e).__name__.lower()
-            if (
-                "not found" in error_msg
-                or "does not exist" in error_msg
-                or "tablenotfound" in error_type
-            ):
-                raise AitaemTableNotFoundError(
-                    f"Table '{table_name}' not found in {self.backend_type} backend"
-                ) from e
-            raise
         except Exception as e:
-            # Catch other exceptions and check for table not found patterns
-            error_msg = str(e).lower()
-            error_type = type(e).__name__.lower()
-            if (
-                "not found" in error_msg
-                or "does not exist" in error_msg
-                or "tablenotfound" in error_type
-            ):
+            # Ibis and the native drivers don't share a table-not-found type
+            if _is_table_not_found(e):
                 raise AitaemTableNotFoundError(
                     f"Table '{table_name}' not found in {self.backend_type} backend"
                 ) from e
@@ -235,22 +224,22 @@ class IbisConnector:
         Raises:
             InvalidURIError: If table name has <2 parts
         """
-        parts = table_name.split(".")
-        if len(parts) < 2:
+        dot_count = table_name.count(".")
+        if dot_count < 1:
             raise InvalidURIError(
                 f"BigQuery table name must have at least 2 parts (dataset.table): {table_name}\n\n"
                 "Valid formats:\n"
                 "  dataset.table\n"
                 "  project.dataset.table"
             )
-        if len(parts) == 2:
+        if dot_count == 1:
             return table_name  # Already in dataset.table format
         # 3+ parts: extract everything after first part (project)
-        return ".".join(parts[1:])
+        return table_name[table_name.index(".") + 1 :]
 
     def execute(
         self, expr: ibis.expr.types.Expr, output_format: str = "pandas"
-    ) -> pd.DataFrame | Any:
+    ) -> "pd.DataFrame | Any":
         """Execute a query and return results.
 
         Args:
@@ -309,5 +298,5 @@ class IbisConnector:
 
     def __repr__(self) -> str:
         """Return string representation of connector."""
-        status = "connected" if self.is_connected else "disconnected"
+        status = "connected" if self.connection is not None else "disconnected"
         return f"IbisConnector(backend='{self.backend_type}', status='{status}')"
@@ -0,0 +1,64 @@
+"""Shared fixtures and helpers for connectors module tests."""
+
+import functools
+import importlib.util
+
+import pytest
+
+from aitaem.connectors.connection import ConnectionManager
+from aitaem.connectors.ibis_connector import IbisConnector
+
+
+@functools.lru_cache(maxsize=None)
+def has_module(name: str) -> bool:
+    """Return True if ``name`` is importable, without executing the module itself.
+
+    find_spec() imports parent packages of a dotted name, so a missing parent
+    (e.g. no ``google`` namespace at all) is reported as unavailable too.
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def has_bigquery() -> bool:
+    """Return True if the BigQuery extra (``aitaem[bigquery]``) is installed.
+
+    Probes the client libraries ibis's BigQuery backend imports rather than
+    touching ``ibis.bigquery``, which would load google-cloud-bigquery, gRPC
+    and protobuf at collection time.
+    """
+    return has_module("google.cloud.bigquery") and has_module("google.cloud.bigquery_storage_v1")
+
+
+@pytest.fixture(scope="session")
+def shared_duckdb_manager():
+    """ConnectionManager with one in-memory DuckDB connection, shared across tests.
+
+    Only for tests that read from the manager. Tests that add, close or
+    otherwise mutate connections must build their own ConnectionManager, as
+    close_all() here would close the connector for every other test.
+    """
+    manager = ConnectionManager()
+    manager.add_connection("duckdb", path=":memory:")
+    yield manager
+    manager.close_all()
+
+
+@pytest.fixture(scope="session")
+def duckdb_connector():
+    """In-memory DuckDB IbisConnector, connected once and shared across tests.
+
+    Tests must not close it. Tables created on it outlive the test, so use
+    names no other test relies on.
+
+    Under pytest-xdist every worker process builds its own session fixtures,
+    so each worker connects once to a private ``:memory:`` database; nothing
+    is shared across processes.
+    """
+    connector = IbisConnector("duckdb")
+    connector.connect(":memory:")
+    yield connector
+    connector.close()
@@ -16,24 +16,28 @@ Setup:
 Run these tests explicitly:
     pytest tests/test_connectors/test_bigquery_integration.py -v
 
+Run alongside the rest of the suite in parallel (pytest-xdist):
+    pytest -m integration -n 4 --dist loadgroup
+    All tests here share one xdist group, so a single worker owns the
+    session-scoped BigQuery client and test table while other workers run
+    the remaining tests.
+
 Skip these tests by default:
     pytest tests/test_connectors/ -v  (these won't run)
 """
 
 import os
 
+import numpy as np
+import pandas as pd
 import pytest
 
 from aitaem.connectors import ConnectionManager, IbisConnector
+from tests.test_connectors.conftest import has_bigquery
 
-# Check for BigQuery availability and credentials
-try:
-    import ibis
-
-    _ = ibis.bigquery
-    HAS_BIGQUERY = True
-except (ImportError, AttributeError):
-    HAS_BIGQUERY = False
+# Check for BigQuery availability and credentials; ibis.bigquery itself is only
+# loaded once the bigquery_connector fixture connects
+HAS_BIGQUERY = has_bigquery()
 
 # Get project ID from environment - REQUIRED for integration tests
 GCP_PROJECT_ID = os.environ.get("GCP_PROJECT_ID")
@@ -47,13 +51,19 @@ if not GCP_PROJECT_ID:
 DATASET_ID = os.environ.get("DATASET_ID", "aggregate_tables")
 TEST_TABLE_NAME = "aitaem_test_table"
 
-# Mark all tests in this file to run only when explicitly requested
-pytestmark = pytest.mark.integration
+# Mark all tests in this file to run only when explicitly requested, and pin them
+# to one xdist worker so the test table is created exactly once
+pytestmark = [pytest.mark.integration, pytest.mark.xdist_group("bigquery")]
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def bigquery_connector():
-    """Create a BigQuery connector for integration tests."""
+    """Create a BigQuery connector for integration tests.
+
+    Session-scoped so the ADC discovery and client construction are paid once
+    per run. Kept in this module (not conftest.py) because it is the only one
+    that talks to real BigQuery.
+    """
     if not HAS_BIGQUERY:
         pytest.skip("BigQuery backend not installed")
 
@@ -62,35 +72,26 @@ def bigquery_connector():
 
     yield connector
 
-    # Cleanup: drop test table if it exists
-    try:
-        connector.connection.raw_sql(f"DROP TABLE IF EXISTS {DATASET_ID}.{TEST_TABLE_NAME}")
-    except Exception:
-        pass  # Ignore cleanup errors
-
     connector.close()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def test_table(bigquery_connector):
-    """Create a test table in BigQuery."""
-    # Create a simple test table
+    """Create a test table in BigQuery.
+
+    The table expires server-side an hour after creation, so teardown does not
+    block on a DROP TABLE job.
+    """
+    # Create the table and its rows in a single DDL job: one array literal is
+    # parsed and planned once, unlike a chain of UNION ALL SELECTs
     create_sql = f"""
-    CREATE OR REPLACE TABLE {DATASET_ID}.{TEST_TABLE_NAME} AS
-    SELECT
-        1 AS id,
-        'test_value_1' AS name,
-        100 AS amount
-    UNION ALL
-    SELECT
-        2 AS id,
-        'test_value_2' AS name,
-        200 AS amount
-    UNION ALL
-    SELECT
-        3 AS id,
-        'test_value_3' AS name,
-        300 AS amount
+    CREATE OR REPLACE TABLE {DATASET_ID}.{TEST_TABLE_NAME}
+    OPTIONS(expiration_timestamp=TIMESTAMP_ADD(CURRENT_TIMESTAMP(), INTERVAL 1 HOUR)) AS
+    SELECT * FROM UNNEST(ARRAY<STRUCT<id INT64, name STRING, amount INT64>>[
+        (1, 'test_value_1', 100),
+        (2, 'test_value_2', 200),
+        (3, 'test_value_3', 300)
+    ])
     """
 
     bigquery_connector.connection.raw_sql(create_sql)
@@ -99,6 +100,22 @@ def test_table(bigquery_connector):
     return f"{DATASET_ID}.{TEST_TABLE_NAME}"
 
 
+@pytest.fixture(scope="session")
+def test_ibis_table(bigquery_connector, test_table):
+    """Ibis table expression for the test table, resolved once per session.
+
+    get_table() fetches table metadata from BigQuery; sharing the expression
+    root avoids repeating that round trip in every read-only test.
+    """
+    return bigquery_connector.get_table(test_table)
+
+
+@pytest.fixture(scope="session")
+def test_table_schema(test_ibis_table):
+    """Schema of the test table, shared by the get_table tests."""
+    return test_ibis_table.schema()
+
+
 class TestBigQueryConnectionIntegration:
     """Test real BigQuery connection."""
 
@@ -113,36 +130,41 @@ class TestBigQueryConnectionIntegration:
         assert bigquery_connector.connection is not None
         assert hasattr(bigquery_connector.connection, "raw_sql")
 
+    def test_connection_uses_storage_read_api(self, bigquery_connector):
+        """Test that results are fetched via the BigQuery Storage Read API.
+
+        Ibis builds a BigQueryReadClient on connect and passes it to every
+        to_pandas()/to_pyarrow() call, so execute() streams Arrow over gRPC
+        instead of paging JSON through tabledata.list.
+        """
+        assert bigquery_connector.connection.storage_client is not None
+
 
 class TestBigQueryTableOperations:
     """Test real table operations with BigQuery."""
 
-    def test_get_table_with_two_part_name(self, bigquery_connector, test_table):
+    def test_get_table_with_two_part_name(self, test_ibis_table, test_table_schema):
         """Test getting table with dataset.table format."""
-        table = bigquery_connector.get_table(f"{DATASET_ID}.{TEST_TABLE_NAME}")
-        assert table is not None
+        assert test_ibis_table is not None
 
         # Verify table structure
-        schema = table.schema()
-        assert "id" in schema.names
-        assert "name" in schema.names
-        assert "amount" in schema.names
+        assert "id" in test_table_schema.names
+        assert "name" in test_table_schema.names
+        assert "amount" in test_table_schema.names
 
-    def test_get_table_with_three_part_name(self, bigquery_connector, test_table):
+    def test_get_table_with_three_part_name(self, bigquery_connector, test_table_schema):
         """Test getting table with project.dataset.table format."""
         full_name = f"{GCP_PROJECT_ID}.{DATASET_ID}.{TEST_TABLE_NAME}"
         table = bigquery_connector.get_table(full_name)
         assert table is not None
 
-        # Verify table structure
-        schema = table.schema()
-        assert "id" in schema.names
-        assert "name" in schema.names
-        assert "amount" in schema.names
+        # Same table as the dataset.table form; ibis binds the schema when the
+        # table is resolved, so schema() here is a local read
+        assert table.schema() == test_table_schema
 
-    def test_execute_query_returns_data(self, bigquery_connector, test_table):
+    def test_execute_query_returns_data(self, bigquery_connector, test_ibis_table):
         """Test executing a query and getting real data."""
-        table = bigquery_connector.get_table(f"{DATASET_ID}.{TEST_TABLE_NAME}")
+        table = test_ibis_table
 
         # Execute a simple query
         result = bigquery_connector.execute(table, output_format="pandas")
@@ -150,17 +172,17 @@ class TestBigQueryTableOperations:
         # Verify results (sort by id since order is not guaranteed)
         result = result.sort_values("id").reset_index(drop=True)
         assert len(result) == 3
-        assert list(result["id"]) == [1, 2, 3]
-        assert list(result["name"]) == [
-            "test_value_1",
-            "test_value_2",
-            "test_value_3",
-        ]
-        assert list(result["amount"]) == [100, 200, 300]
-
-    def test_execute_filtered_query(self, bigquery_connector, test_table):
+        assert np.array_equal(result["id"].to_numpy(), np.array([1, 2, 3]))
+        pd.testing.assert_series_equal(
+            result["name"],
+            pd.Series(["test_value_1", "test_value_2", "test_value_3"], name="name"),
+            check_dtype=False,
+        )
+        assert np.array_equal(result["amount"].to_numpy(), np.array([100, 200, 300]))
+
+    def test_execute_filtered_query(self, bigquery_connector, test_ibis_table):
         """Test executing a filtered query."""
-        table = bigquery_connector.get_table(f"{DATASET_ID}.{TEST_TABLE_NAME}")
+        table = test_ibis_table
 
         # Filter for id > 1
         filtered = table.filter(table.id > 1)
@@ -169,11 +191,11 @@ class TestBigQueryTableOperations:
         # Verify results (sort by id since order is not guaranteed)
         result = result.sort_values("id").reset_index(drop=True)
         assert len(result) == 2
-        assert list(result["id"]) == [2, 3]
+        assert np.array_equal(result["id"].to_numpy(), np.array([2, 3]))
 
-    def test_execute_aggregation_query(self, bigquery_connector, test_table):
+    def test_execute_aggregation_query(self, bigquery_connector, test_ibis_table):
         """Test executing an aggregation query."""
-        table = bigquery_connector.get_table(f"{DATASET_ID}.{TEST_TABLE_NAME}")
+        table = test_ibis_table
 
         # Aggregate: sum of amounts (returns a table with one row)
         total_expr = table.aggregate(total=table.amount.sum())
@@ -238,42 +260,31 @@ bigquery:
 class TestBigQueryEndToEnd:
     """End-to-end integration tests."""
 
-    def test_full_workflow(self, test_table):
-        """Test complete workflow: YAML → Connection → Query → Results."""
-        # 1. Create YAML config
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            f.write(
-                f"""
-bigquery:
-  project_id: {GCP_PROJECT_ID}
-"""
-            )
-            config_path = f.name
-
-        try:
-            # 2. Load configuration
-            manager = ConnectionManager.from_yaml(config_path)
+    def test_full_workflow(self, bigquery_connector, test_table):
+        """Test complete workflow: Connection → URI routing → Query → Results.
 
-            # 3. Get connection via URI
-            uri = f"bigquery://{GCP_PROJECT_ID}.{DATASET_ID}.{TEST_TABLE_NAME}"
-            connector = manager.get_connection_for_source(uri)
+        Registers the session connector instead of loading a YAML config, which
+        would authenticate against GCP again; YAML → connect is covered by
+        test_yaml_config_with_bigquery.
+        """
+        # 1. Register the existing connection
+        manager = ConnectionManager()
+        manager.add_connection("bigquery", connector=bigquery_connector)
 
-            # 4. Get table
-            table = connector.get_table(f"{DATASET_ID}.{TEST_TABLE_NAME}")
+        # 2. Get connection via URI
+        uri = f"bigquery://{GCP_PROJECT_ID}.{DATASET_ID}.{TEST_TABLE_NAME}"
+        connector = manager.get_connection_for_source(uri)
+        assert connector is bigquery_connector
 
-            # 5. Execute query
-            query = table.filter(table.amount >= 200)
-            result = connector.execute(query, output_format="pandas")
+        # 3. Get table
+        table = connector.get_table(f"{DATASET_ID}.{TEST_TABLE_NAME}")
 
-            # 6. Verify results
-            assert len(result) == 2
-            assert all(result["amount"] >= 200)
+        # 4. Execute query
+        query = table.filter(table.amount >= 200)
+        result = connector.execute(query, output_format="pandas")
 
-            # 7. Cleanup
-            manager.close_all()
+        # 5. Verify results
+        assert len(result) == 2
+        assert (result["amount"] >= 200).all()
 
-        finally:
-            # Remove temp file
-            os.unlink(config_path)
+        # No close_all(): the connector belongs to the session fixture
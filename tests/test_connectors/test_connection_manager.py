@@ -14,15 +14,10 @@ from aitaem.utils.exceptions import (
     InvalidURIError,
     UnsupportedBackendError,
 )
+from tests.test_connectors.conftest import has_bigquery
 
 # Check for optional dependencies
-try:
-    import ibis
-
-    _ = ibis.bigquery  # Trigger lazy loading
-    HAS_BIGQUERY = True
-except (ImportError, AttributeError):
-    HAS_BIGQUERY = False
+HAS_BIGQUERY = has_bigquery()
 
 
 class TestYAMLLoading:
@@ -61,25 +56,59 @@ class TestYAMLLoading:
         manager = ConnectionManager.from_yaml(str(yaml_file))
         assert len(manager._connections) == 0
 
-    def test_missing_required_field_duckdb(self, tmp_path):
-        """Test that missing 'path' in DuckDB config raises ConfigurationError."""
-        yaml_file = tmp_path / "missing_path.yaml"
-        yaml_file.write_text("duckdb:\n  read_only: true\n")
+    def test_repeated_load_reuses_parsed_yaml(self, tmp_path):
+        """Test that loading an unchanged file twice parses it only once."""
+        from aitaem.connectors.connection import _load_yaml_cached
+
+        yaml_file = tmp_path / "cached.yaml"
+        yaml_file.write_text("duckdb:\n  path: ':memory:'\n")
+
+        ConnectionManager.from_yaml(str(yaml_file)).close_all()
+        hits_before = _load_yaml_cached.cache_info().hits
+        ConnectionManager.from_yaml(str(yaml_file)).close_all()
+
+        assert _load_yaml_cached.cache_info().hits == hits_before + 1
+
+    def test_edited_yaml_is_reloaded(self, tmp_path):
+        """Test that a changed file is re-parsed rather than served from the cache."""
+        yaml_file = tmp_path / "edited.yaml"
+        yaml_file.write_text("")
+        assert len(ConnectionManager.from_yaml(str(yaml_file))._connections) == 0
+
+        yaml_file.write_text("duckdb:\n  path: ':memory:'\n")
+        manager = ConnectionManager.from_yaml(str(yaml_file))
+
+        assert "duckdb" in manager._connections
+        manager.close_all()
+
+    @pytest.mark.parametrize(
+        "yaml_text, missing_field",
+        [
+            ("duckdb:\n  read_only: true\n", "path"),
+            ("bigquery:\n  dataset_id: test\n", "project_id"),
+        ],
+        ids=["duckdb-path", "bigquery-project_id"],
+    )
+    def test_missing_required_field(self, tmp_path, yaml_text, missing_field):
+        """Test that a missing required backend field raises ConfigurationError."""
+        yaml_file = tmp_path / "missing_field.yaml"
+        yaml_file.write_text(yaml_text)
 
         with pytest.raises(ConfigurationError) as exc_info:
             ConnectionManager.from_yaml(str(yaml_file))
 
-        assert "path" in str(exc_info.value)
+        assert missing_field in str(exc_info.value)
 
-    def test_missing_required_field_bigquery(self, tmp_path):
-        """Test that missing 'project_id' in BigQuery config raises ConfigurationError."""
-        yaml_file = tmp_path / "missing_project.yaml"
-        yaml_file.write_text("bigquery:\n  dataset_id: test\n")
+    @pytest.mark.parametrize("key", ["123", "null"], ids=["int-key", "null-key"])
+    def test_non_string_backend_key(self, tmp_path, key):
+        """Test that a non-string backend key raises UnsupportedBackendError."""
+        yaml_file = tmp_path / "non_string_key.yaml"
+        yaml_file.write_text(f"{key}:\n  path: ':memory:'\n")
 
-        with pytest.raises(ConfigurationError) as exc_info:
+        with pytest.raises(UnsupportedBackendError) as exc_info:
             ConnectionManager.from_yaml(str(yaml_file))
 
-        assert "project_id" in str(exc_info.value)
+        assert "Supported backends" in str(exc_info.value)
 
 
 class TestEnvironmentVariableSubstitution:
@@ -133,6 +162,46 @@ duckdb:
         manager = ConnectionManager.from_yaml(str(yaml_file))
         assert "duckdb" in manager._connections
 
+    def test_nested_substitution(self, monkeypatch):
+        """Test that substitution reaches values in nested mappings."""
+        monkeypatch.setenv("NESTED_VALUE", "resolved")
+        config = {"outer": {"inner": {"value": "${NESTED_VALUE}", "port": 5432}}}
+
+        result = ConnectionManager()._substitute_env_vars_in_dict(config, "config.yaml")
+
+        assert result == {"outer": {"inner": {"value": "resolved", "port": 5432}}}
+
+    def test_config_without_placeholders_returned_as_is(self):
+        """Test that a config with no ${...} references is not copied."""
+        config = {"path": ":memory:", "options": {"read_only": False}}
+
+        result = ConnectionManager()._substitute_env_vars_in_dict(config, "config.yaml")
+
+        assert result is config
+
+    def test_many_substitutions_in_large_value(self, monkeypatch):
+        """Test that every placeholder in a ~10KB value is replaced in one pass."""
+        monkeypatch.setenv("STRESS_A", "alpha")
+        monkeypatch.setenv("STRESS_B", "beta")
+        value = "key: ${STRESS_A}-${STRESS_B};" * 400
+
+        result = ConnectionManager()._substitute_env_vars(value, "config.yaml")
+
+        assert result == "key: alpha-beta;" * 400
+        assert "${" not in result
+
+    def test_substitution_uses_current_environment(self, monkeypatch, tmp_path):
+        """Test that env vars are resolved on every load, not baked into the YAML cache."""
+        yaml_file = tmp_path / "env_reload.yaml"
+        yaml_file.write_text("duckdb:\n  path: ${DUCKDB_PATH}\n")
+
+        monkeypatch.setenv("DUCKDB_PATH", ":memory:")
+        ConnectionManager.from_yaml(str(yaml_file)).close_all()
+
+        monkeypatch.delenv("DUCKDB_PATH")
+        with pytest.raises(ConfigurationError, match="DUCKDB_PATH"):
+            ConnectionManager.from_yaml(str(yaml_file))
+
     def test_missing_env_var(self, tmp_path):
         """Test that missing environment variable raises ConfigurationError."""
         yaml_file = tmp_path / "missing_env.yaml"
@@ -174,12 +243,9 @@ class TestConnectionManagement:
         assert "bigquery" in manager._connections
         assert isinstance(manager._connections["bigquery"], IbisConnector)
 
-    def test_get_connection_success(self):
+    def test_get_connection_success(self, shared_duckdb_manager):
         """Test getting existing connection by backend type."""
-        manager = ConnectionManager()
-        manager.add_connection("duckdb", path=":memory:")
-
-        connector = manager.get_connection("duckdb")
+        connector = shared_duckdb_manager.get_connection("duckdb")
         assert isinstance(connector, IbisConnector)
         assert connector.backend_type == "duckdb"
 
@@ -246,116 +312,105 @@ class TestConnectionManagement:
 class TestURIParsing:
     """Test URI parsing functionality."""
 
-    def test_parse_duckdb_uri_simple(self):
-        """Test parsing simple DuckDB URI."""
-        backend, database, table = ConnectionManager.parse_source_uri(
-            "duckdb://analytics.db/events"
-        )
-        assert backend == "duckdb"
-        assert database == "analytics.db"
-        assert table == "events"
-
-    def test_parse_duckdb_uri_memory(self):
-        """Test parsing DuckDB in-memory URI."""
-        backend, database, table = ConnectionManager.parse_source_uri("duckdb://:memory:/events")
-        assert backend == "duckdb"
-        assert database == ":memory:"
-        assert table == "events"
-
-    def test_parse_duckdb_uri_absolute_path(self):
-        """Test parsing DuckDB URI with absolute path."""
-        backend, database, table = ConnectionManager.parse_source_uri("duckdb:///abs/path/db/table")
-        assert backend == "duckdb"
-        assert database == "/abs/path/db"
-        assert table == "table"
-
-    def test_parse_duckdb_uri_nested_path(self):
-        """Test parsing DuckDB URI with nested path."""
-        backend, database, table = ConnectionManager.parse_source_uri(
-            "duckdb://data/analytics/prod.db/events"
-        )
-        assert backend == "duckdb"
-        assert database == "data/analytics/prod.db"
-        assert table == "events"
-
-    def test_parse_bigquery_uri_dot_format(self):
-        """Test parsing BigQuery URI with dot format."""
-        backend, project, table = ConnectionManager.parse_source_uri(
-            "bigquery://my-project.dataset.table"
-        )
-        assert backend == "bigquery"
-        assert project == "my-project"
-        assert table == "dataset.table"
-
-    def test_parse_bigquery_uri_slash_format(self):
-        """Test parsing BigQuery URI with slash format (normalized to dots)."""
-        backend, project, table = ConnectionManager.parse_source_uri(
-            "bigquery://project/dataset.table"
-        )
-        assert backend == "bigquery"
-        assert project == "project"
-        assert table == "dataset.table"
-
-    def test_parse_bigquery_uri_extra_parts(self):
-        """Test parsing BigQuery URI with extra parts (>3)."""
-        backend, project, table = ConnectionManager.parse_source_uri("bigquery://proj.ds.tbl.extra")
-        assert backend == "bigquery"
-        assert project == "proj"
-        assert table == "ds.tbl.extra"
-
-    def test_missing_scheme(self):
-        """Test that URI without scheme raises InvalidURIError."""
-        with pytest.raises(InvalidURIError) as exc_info:
-            ConnectionManager.parse_source_uri("analytics.db/events")
-
-        assert "Missing backend type" in str(exc_info.value)
-
-    def test_empty_table_name(self):
-        """Test that empty table name raises InvalidURIError."""
+    @pytest.mark.parametrize(
+        "uri, expected_backend, expected_db, expected_table",
+        [
+            ("duckdb://analytics.db/events", "duckdb", "analytics.db", "events"),
+            ("duckdb://:memory:/events", "duckdb", ":memory:", "events"),
+            ("duckdb:///abs/path/db/table", "duckdb", "/abs/path/db", "table"),
+            (
+                "duckdb://data/analytics/prod.db/events",
+                "duckdb",
+                "data/analytics/prod.db",
+                "events",
+            ),
+            ("bigquery://my-project.dataset.table", "bigquery", "my-project", "dataset.table"),
+            # Slash format is normalized to dots
+            ("bigquery://project/dataset.table", "bigquery", "project", "dataset.table"),
+            ("bigquery://proj.ds.tbl.extra", "bigquery", "proj", "ds.tbl.extra"),
+            ("postgres://public/events", "postgres", "public", "events"),
+            ("postgres:///events", "postgres", "", "events"),
+            ("postgres://analytics/orders", "postgres", "analytics", "orders"),
+            (" duckdb://analytics.db/events", "duckdb", "analytics.db", "events"),
+            ("\x00duckdb://analytics.db/events", "duckdb", "analytics.db", "events"),
+            # Only leading whitespace is stripped, as with urlparse
+            ("duckdb://analytics.db/events ", "duckdb", "analytics.db", "events "),
+            ("DuckDB://analytics.db/events", "duckdb", "analytics.db", "events"),
+            ("duckdb://ana\tlytics.db/events", "duckdb", "analytics.db", "events"),
+            ("duckdb://analytics.db/events?x=1", "duckdb", "analytics.db", "events"),
+            ("duckdb://analytics.db/events#frag", "duckdb", "analytics.db", "events"),
+        ],
+        ids=[
+            "duckdb-simple",
+            "duckdb-memory",
+            "duckdb-absolute-path",
+            "duckdb-nested-path",
+            "bigquery-dot-format",
+            "bigquery-slash-format",
+            "bigquery-extra-parts",
+            "postgres-schema",
+            "postgres-no-schema",
+            "postgres-custom-schema",
+            "leading-whitespace",
+            "leading-control-char",
+            "trailing-whitespace-kept",
+            "uppercase-scheme",
+            "embedded-tab",
+            "query-dropped",
+            "fragment-dropped",
+        ],
+    )
+    def test_parse_uri(self, uri, expected_backend, expected_db, expected_table):
+        """Test parsing valid URIs into (backend, database/project/schema, table)."""
+        backend, database, table = ConnectionManager.parse_source_uri(uri)
+        assert backend == expected_backend
+        assert database == expected_db
+        assert table == expected_table
+
+    def test_parse_source_uri_is_cached(self):
+        """Test that repeated parses of the same URI are served from the cache."""
+        uri = "duckdb://cache_check.db/events"
+        first = ConnectionManager.parse_source_uri(uri)
+        hits_before = ConnectionManager.parse_source_uri.cache_info().hits
+
+        assert ConnectionManager.parse_source_uri(uri) is first
+        assert ConnectionManager.parse_source_uri.cache_info().hits == hits_before + 1
+
+    @pytest.mark.parametrize(
+        "uri, err_substr",
+        [
+            ("analytics.db/events", "Missing backend type"),
+            ("duckdb://analytics.db/", "Empty table name"),
+            ("bigquery://project.dataset", "at least 3 parts"),
+            ("duckdb://analytics.db", "table separator"),
+            ("postgres://public/", "Empty table name"),
+            ("postgres://events", "table separator"),
+            ("duckdb:analytics.db/events", "Missing backend type"),
+            ("1duck://analytics.db/events", "Missing backend type"),
+            ("foo bar://analytics.db/events", "Missing backend type"),
+            ("duckdb://?x=1", "Empty path"),
+            ("\xa0duckdb://analytics.db/events", "Missing backend type"),
+        ],
+        ids=[
+            "missing-scheme",
+            "duckdb-empty-table",
+            "bigquery-insufficient-parts",
+            "duckdb-no-separator",
+            "postgres-empty-table",
+            "postgres-no-separator",
+            "single-colon-scheme",
+            "scheme-leading-digit",
+            "scheme-with-space",
+            "query-only",
+            "leading-non-ascii-space",
+        ],
+    )
+    def test_invalid_uri(self, uri, err_substr):
+        """Test that malformed URIs raise InvalidURIError with a helpful message."""
         with pytest.raises(InvalidURIError) as exc_info:
-            ConnectionManager.parse_source_uri("duckdb://analytics.db/")
+            ConnectionManager.parse_source_uri(uri)
 
-        assert "Empty table name" in str(exc_info.value)
-
-    def test_bigquery_insufficient_parts(self):
-        """Test that BigQuery URI with <3 parts raises InvalidURIError."""
-        with pytest.raises(InvalidURIError) as exc_info:
-            ConnectionManager.parse_source_uri("bigquery://project.dataset")
-
-        assert "at least 3 parts" in str(exc_info.value)
-
-    def test_duckdb_no_table_separator(self):
-        """Test that DuckDB URI without table separator raises InvalidURIError."""
-        with pytest.raises(InvalidURIError) as exc_info:
-            ConnectionManager.parse_source_uri("duckdb://analytics.db")
-
-        assert "table separator" in str(exc_info.value).lower()
-
-    def test_parse_postgres_uri_with_schema(self):
-        backend, schema, table = ConnectionManager.parse_source_uri("postgres://public/events")
-        assert backend == "postgres"
-        assert schema == "public"
-        assert table == "events"
-
-    def test_parse_postgres_uri_no_schema(self):
-        backend, schema, table = ConnectionManager.parse_source_uri("postgres:///events")
-        assert backend == "postgres"
-        assert schema == ""
-        assert table == "events"
-
-    def test_parse_postgres_uri_custom_schema(self):
-        backend, schema, table = ConnectionManager.parse_source_uri("postgres://analytics/orders")
-        assert backend == "postgres"
-        assert schema == "analytics"
-        assert table == "orders"
-
-    def test_parse_postgres_uri_empty_table_raises(self):
-        with pytest.raises(InvalidURIError, match="Empty table name"):
-            ConnectionManager.parse_source_uri("postgres://public/")
-
-    def test_parse_postgres_uri_no_separator_raises(self):
-        with pytest.raises(InvalidURIError, match="table separator"):
-            ConnectionManager.parse_source_uri("postgres://events")
+        assert err_substr.lower() in str(exc_info.value).lower()
 
 
 class TestPostgresConnectionManagement:
@@ -407,12 +462,9 @@ class TestPostgresConnectionManagement:
 class TestConnectionRouting:
     """Test get_connection_for_source() routing functionality."""
 
-    def test_get_connection_for_source_duckdb(self):
+    def test_get_connection_for_source_duckdb(self, shared_duckdb_manager):
         """Test routing DuckDB URI to correct connection."""
-        manager = ConnectionManager()
-        manager.add_connection("duckdb", path=":memory:")
-
-        connector = manager.get_connection_for_source("duckdb://:memory:/events")
+        connector = shared_duckdb_manager.get_connection_for_source("duckdb://:memory:/events")
         assert isinstance(connector, IbisConnector)
         assert connector.backend_type == "duckdb"
 
@@ -429,6 +481,20 @@ class TestConnectionRouting:
         assert isinstance(connector, IbisConnector)
         assert connector.backend_type == "bigquery"
 
+    def test_get_connection_for_source_cached(self):
+        """Test that repeated lookups reuse the resolved connector until close_all()."""
+        manager = ConnectionManager()
+        manager.add_connection("duckdb", path=":memory:")
+
+        first = manager.get_connection_for_source("duckdb://:memory:/events")
+        assert manager.get_connection_for_source("duckdb://:memory:/events") is first
+        assert "duckdb://:memory:/events" in manager._resolve_cache
+
+        manager.close_all()
+        assert not manager._resolve_cache
+        with pytest.raises(ConnectionNotFoundError):
+            manager.get_connection_for_source("duckdb://:memory:/events")
+
     def test_get_connection_for_source_not_configured(self):
         """Test that routing to unconfigured backend raises ConnectionNotFoundError."""
         manager = ConnectionManager()
@@ -470,14 +536,22 @@ duckdb:
 
         assert len(manager._connections) == 0
 
-    def test_repr(self):
+    def test_repr(self, shared_duckdb_manager):
         """Test string representation of ConnectionManager."""
+        repr_str = repr(shared_duckdb_manager)
+        assert "ConnectionManager" in repr_str
+        assert "duckdb" in repr_str
+
+    def test_repr_reflects_connection_changes(self):
+        """Test that the cached repr is refreshed when backends are added or closed."""
         manager = ConnectionManager()
+        assert repr(manager) == "ConnectionManager(backends=[])"
+
         manager.add_connection("duckdb", path=":memory:")
+        assert repr(manager) == "ConnectionManager(backends=['duckdb'])"
 
-        repr_str = repr(manager)
-        assert "ConnectionManager" in repr_str
-        assert "duckdb" in repr_str
+        manager.close_all()
+        assert repr(manager) == "ConnectionManager(backends=[])"
 
 
 class TestCrossBackendConn:
@@ -4,6 +4,10 @@ tests.test_connectors.test_ibis_connector - Tests for IbisConnector
 Test coverage for DuckDB and BigQuery connector functionality.
 """
 
+import uuid
+from unittest.mock import MagicMock
+
+import ibis
 import pytest
 
 from aitaem.connectors import IbisConnector
@@ -14,22 +18,67 @@ from aitaem.utils.exceptions import (
     TableNotFoundError,
     UnsupportedBackendError,
 )
+from tests.test_connectors.conftest import has_bigquery, has_module
 
-# Check for optional dependencies
-try:
-    import ibis
-
-    _ = ibis.bigquery  # Trigger lazy loading
-    HAS_BIGQUERY = True
-except (ImportError, AttributeError):
-    HAS_BIGQUERY = False
+# Check for optional dependencies without importing them; ibis.bigquery is only
+# loaded when a test patches ibis.bigquery.connect
+HAS_BIGQUERY = has_bigquery()
+HAS_POLARS = has_module("polars")
 
-try:
+if HAS_POLARS:
+    # Pay the polars import during collection rather than inside the first
+    # polars-output test
     import polars  # noqa: F401
 
-    HAS_POLARS = True
-except ImportError:
-    HAS_POLARS = False
+# ibis (and the DuckDB client below it) emit DeprecationWarnings on execute that
+# are outside aitaem's control; filter them once for the whole module
+pytestmark = pytest.mark.filterwarnings(r"ignore::DeprecationWarning:ibis\..*")
+
+# Unbound expression for tests that only need something to pass to execute()
+_LITERAL_ONE = ibis.literal(1)
+
+
+@pytest.fixture
+def events_table(duckdb_connector):
+    """Name of a one-row (1, 'test') table on the shared DuckDB, dropped after the test."""
+    name = f"events_{uuid.uuid4().hex[:8]}"
+    # One multi-statement batch: DuckDB parses and runs both in a single call
+    duckdb_connector.connection.raw_sql(
+        f"CREATE TABLE {name} (id INTEGER, name VARCHAR); INSERT INTO {name} VALUES (1, 'test');"
+    )
+    yield name
+    duckdb_connector.connection.raw_sql(f"DROP TABLE IF EXISTS {name}")
+
+
+@pytest.fixture(scope="session")
+def duckdb_file(tmp_path_factory):
+    """Path of a DuckDB database file created by IbisConnector.connect(), once per session."""
+    db_path = tmp_path_factory.mktemp("ibis") / "test.db"
+    connector = IbisConnector("duckdb")
+    connector.connect(str(db_path))
+    connector.close()
+    return db_path
+
+
+@pytest.fixture(scope="class")
+def bq_mock_backend():
+    """Mock ibis BigQuery backend, built once per test class."""
+    return MagicMock()
+
+
+@pytest.fixture
+def bigquery_connector(mocker, bq_mock_backend):
+    """Connected BigQuery IbisConnector over a mocked ibis backend.
+
+    Yields ``(connector, mock_backend)``. The mock is shared by the class and
+    reset after each test so call assertions only see that test's calls.
+    """
+    mocker.patch("ibis.bigquery.connect", return_value=bq_mock_backend)
+    connector = IbisConnector("bigquery")
+    connector.connect(project_id="test-project")
+    yield connector, bq_mock_backend
+    connector.close()
+    bq_mock_backend.reset_mock()
 
 
 class TestIbisConnectorInitialization:
@@ -54,12 +103,6 @@ class TestIbisConnectorInitialization:
         assert "clickhouse" in str(exc_info.value)
         assert "Supported backends" in str(exc_info.value)
 
-    def test_initial_state_disconnected(self):
-        """Test that connector starts in disconnected state."""
-        connector = IbisConnector("duckdb")
-        assert not connector.is_connected
-        assert connector.connection is None
-
 
 class TestDuckDBConnection:
     """Test DuckDB connection functionality."""
@@ -78,35 +121,27 @@ class TestDuckDBConnection:
         assert connector.is_connected
         connector.close()
 
-    def test_connect_file_database(self, tmp_path):
-        """Test connecting to file-based DuckDB database."""
-        db_path = tmp_path / "test.db"
+    def test_connect_file_database(self, duckdb_file):
+        """Test that connecting to a file-based DuckDB database creates the file."""
+        assert duckdb_file.exists()
+
+    def test_connect_with_read_only(self, duckdb_file):
+        """Test connecting to DuckDB with read_only parameter."""
         connector = IbisConnector("duckdb")
-        connector.connect(str(db_path))
+        connector.connect(str(duckdb_file), read_only=True)
         assert connector.is_connected
-        assert db_path.exists()
         connector.close()
 
-    def test_connect_with_read_only(self, tmp_path):
-        """Test connecting to DuckDB with read_only parameter."""
-        db_path = tmp_path / "test.db"
-        # First create the database
-        connector1 = IbisConnector("duckdb")
-        connector1.connect(str(db_path))
-        connector1.close()
-
-        # Then connect read-only
-        connector2 = IbisConnector("duckdb")
-        connector2.connect(str(db_path), read_only=True)
-        assert connector2.is_connected
-        connector2.close()
-
-    def test_connection_state_after_connect(self):
-        """Test that is_connected is True after successful connection."""
+    @pytest.mark.parametrize(
+        "do_connect, expected", [(False, False), (True, True)], ids=["initial", "after-connect"]
+    )
+    def test_connection_state(self, do_connect, expected):
+        """Test that is_connected is False on a new connector and True after connecting."""
         connector = IbisConnector("duckdb")
-        assert not connector.is_connected
-        connector.connect(":memory:")
-        assert connector.is_connected
+        if do_connect:
+            connector.connect(":memory:")
+        assert connector.is_connected is expected
+        assert (connector.connection is not None) is expected
         connector.close()
 
 
@@ -114,16 +149,10 @@ class TestBigQueryConnection:
     """Test BigQuery connection functionality (mocked)."""
 
     @pytest.mark.skipif(not HAS_BIGQUERY, reason="BigQuery backend not installed")
-    def test_connect_success(self, mocker):
+    def test_connect_success(self, bigquery_connector):
         """Test successful BigQuery connection with mocked credentials."""
-        mock_backend = mocker.Mock()
-        mocker.patch("ibis.bigquery.connect", return_value=mock_backend)
-
-        connector = IbisConnector("bigquery")
-        connector.connect(project_id="test-project")
-
+        connector, _ = bigquery_connector
         assert connector.is_connected
-        connector.close()
 
     @pytest.mark.skipif(not HAS_BIGQUERY, reason="BigQuery backend not installed")
     def test_connect_without_dataset_id(self, mocker):
@@ -172,84 +201,48 @@ class TestBigQueryConnection:
 class TestGetTable:
     """Test get_table() functionality."""
 
-    def test_get_table_duckdb_success(self):
+    def test_get_table_duckdb_success(self, duckdb_connector, events_table):
         """Test getting table from DuckDB with test data."""
-        connector = IbisConnector("duckdb")
-        connector.connect(":memory:")
-
-        # Create a test table
-        connector.connection.raw_sql("CREATE TABLE events (id INTEGER, name VARCHAR)")
-        connector.connection.raw_sql("INSERT INTO events VALUES (1, 'test')")
+        connector = duckdb_connector
 
         # Get table reference
-        table = connector.get_table("events")
-        assert table is not None
-        assert "events" in str(table)
-
-        connector.close()
-
-    @pytest.mark.skipif(not HAS_BIGQUERY, reason="BigQuery backend not installed")
-    def test_get_table_bigquery_success(self, mocker):
-        """Test getting table from BigQuery (mocked)."""
-        mock_table = mocker.Mock()
-        mock_backend = mocker.Mock()
-        mock_backend.table.return_value = mock_table
-        mocker.patch("ibis.bigquery.connect", return_value=mock_backend)
-
-        connector = IbisConnector("bigquery")
-        connector.connect(project_id="test-project")
-
-        table = connector.get_table("dataset.table")
+        table = connector.get_table(events_table)
         assert table is not None
-        mock_backend.table.assert_called_once_with("dataset.table")
-
-        connector.close()
+        assert events_table in str(table)
 
     @pytest.mark.skipif(not HAS_BIGQUERY, reason="BigQuery backend not installed")
-    def test_get_table_bigquery_three_part_name(self, mocker):
-        """Test getting table with 3-part BigQuery name extracts dataset.table."""
-        mock_table = mocker.Mock()
-        mock_backend = mocker.Mock()
-        mock_backend.table.return_value = mock_table
-        mocker.patch("ibis.bigquery.connect", return_value=mock_backend)
-
-        connector = IbisConnector("bigquery")
-        connector.connect(project_id="test-project")
-
-        table = connector.get_table("project.dataset.table")
-        assert table is not None
-        # Should extract 'dataset.table' from 'project.dataset.table'
-        mock_backend.table.assert_called_once_with("dataset.table")
-
-        connector.close()
-
-    @pytest.mark.skipif(not HAS_BIGQUERY, reason="BigQuery backend not installed")
-    def test_get_table_bigquery_invalid_name(self, mocker):
-        """Test that single-part BigQuery table name raises InvalidURIError."""
-        mock_backend = mocker.Mock()
-        mocker.patch("ibis.bigquery.connect", return_value=mock_backend)
-
-        connector = IbisConnector("bigquery")
-        connector.connect(project_id="test-project")
-
-        with pytest.raises(InvalidURIError) as exc_info:
-            connector.get_table("table")
-
-        assert "at least 2 parts" in str(exc_info.value)
-        connector.close()
-
-    def test_get_table_not_found(self):
+    @pytest.mark.parametrize(
+        "name, expected",
+        [
+            ("dataset.table", "dataset.table"),
+            # Should extract 'dataset.table' from 'project.dataset.table'
+            ("project.dataset.table", "dataset.table"),
+            ("table", InvalidURIError),
+        ],
+        ids=["two-part", "three-part", "single-part"],
+    )
+    def test_get_table_bigquery(self, bigquery_connector, name, expected):
+        """Test BigQuery table name handling in get_table (mocked)."""
+        connector, mock_backend = bigquery_connector
+
+        if isinstance(expected, type) and issubclass(expected, Exception):
+            with pytest.raises(expected) as exc_info:
+                connector.get_table(name)
+            assert "at least 2 parts" in str(exc_info.value)
+            mock_backend.table.assert_not_called()
+        else:
+            table = connector.get_table(name)
+            assert table is not None
+            mock_backend.table.assert_called_once_with(expected)
+
+    def test_get_table_not_found(self, duckdb_connector):
         """Test that non-existent table raises TableNotFoundError."""
-        connector = IbisConnector("duckdb")
-        connector.connect(":memory:")
-
         # Try to get a table that doesn't exist
         # The connector should wrap it in TableNotFoundError
         with pytest.raises(TableNotFoundError) as exc_info:
-            connector.get_table("nonexistent")
+            duckdb_connector.get_table("nonexistent")
 
         assert "nonexistent" in str(exc_info.value)
-        connector.close()
 
     def test_get_table_not_connected(self):
         """Test that get_table raises ConnectionError when not connected."""
@@ -262,71 +255,46 @@ class TestGetTable:
 class TestExecute:
     """Test execute() functionality."""
 
-    def test_execute_pandas_output(self):
-        """Test executing query and returning pandas DataFrame."""
-        connector = IbisConnector("duckdb")
-        connector.connect(":memory:")
-
-        # Create test table
-        connector.connection.raw_sql("CREATE TABLE events (id INTEGER, name VARCHAR)")
-        connector.connection.raw_sql("INSERT INTO events VALUES (1, 'test')")
-
-        # Execute query
-        table = connector.get_table("events")
-        result = connector.execute(table, output_format="pandas")
-
-        assert result is not None
-        assert len(result) == 1
-        assert result.iloc[0]["id"] == 1
-        assert result.iloc[0]["name"] == "test"
-
-        connector.close()
-
-    @pytest.mark.skipif(not HAS_POLARS, reason="Polars not installed")
-    def test_execute_polars_output(self):
-        """Test executing query and returning polars DataFrame."""
-        connector = IbisConnector("duckdb")
-        connector.connect(":memory:")
-
-        # Create test table
-        connector.connection.raw_sql("CREATE TABLE events (id INTEGER, name VARCHAR)")
-        connector.connection.raw_sql("INSERT INTO events VALUES (1, 'test')")
+    @pytest.mark.parametrize(
+        "fmt, getter",
+        [
+            ("pandas", lambda r: (r.iloc[0]["id"], r.iloc[0]["name"])),
+            pytest.param(
+                "polars",
+                lambda r: (r["id"][0], r["name"][0]),
+                marks=pytest.mark.skipif(not HAS_POLARS, reason="Polars not installed"),
+            ),
+        ],
+        ids=["pandas", "polars"],
+    )
+    def test_execute_output(self, duckdb_connector, events_table, fmt, getter):
+        """Test executing query and returning a pandas or polars DataFrame."""
+        connector = duckdb_connector
 
         # Execute query
-        table = connector.get_table("events")
-        result = connector.execute(table, output_format="polars")
+        table = connector.get_table(events_table)
+        result = connector.execute(table, output_format=fmt)
 
         assert result is not None
         assert len(result) == 1
-        assert result["id"][0] == 1
-        assert result["name"][0] == "test"
-
-        connector.close()
+        assert getter(result) == (1, "test")
 
-    def test_execute_invalid_output_format(self):
+    def test_execute_invalid_output_format(self, duckdb_connector, events_table):
         """Test that invalid output format raises ValueError."""
-        connector = IbisConnector("duckdb")
-        connector.connect(":memory:")
-
-        connector.connection.raw_sql("CREATE TABLE events (id INTEGER)")
-        table = connector.get_table("events")
+        connector = duckdb_connector
+        table = connector.get_table(events_table)
 
         with pytest.raises(ValueError) as exc_info:
             connector.execute(table, output_format="invalid")
 
         assert "Invalid output_format" in str(exc_info.value)
-        connector.close()
 
     def test_execute_not_connected(self):
         """Test that execute raises ConnectionError when not connected."""
         connector = IbisConnector("duckdb")
-        # Create a mock expression
-        import ibis
-
-        expr = ibis.literal(1)
 
         with pytest.raises(AitaemConnectionError) as exc_info:
-            connector.execute(expr)
+            connector.execute(_LITERAL_ONE)
         assert "Not connected" in str(exc_info.value)
 
 
@@ -379,23 +347,20 @@ class TestLifecycle:
         """Test that close() sets is_connected to False."""
         connector = IbisConnector("duckdb")
         connector.connect(":memory:")
-        assert connector.is_connected
-
         connector.close()
         assert not connector.is_connected
 
-    def test_repr_disconnected(self):
-        """Test __repr__ shows disconnected status."""
+    @pytest.mark.parametrize(
+        "do_connect, expected",
+        [(False, "disconnected"), (True, "connected")],
+        ids=["disconnected", "connected"],
+    )
+    def test_repr(self, do_connect, expected):
+        """Test __repr__ shows the backend and connection status."""
         connector = IbisConnector("duckdb")
+        if do_connect:
+            connector.connect(":memory:")
         repr_str = repr(connector)
         assert "duckdb" in repr_str
-        assert "disconnected" in repr_str
-
-    def test_repr_connected(self):
-        """Test __repr__ shows connected status."""
-        connector = IbisConnector("duckdb")
-        connector.connect(":memory:")
-        repr_str = repr(connector)
-        assert "duckdb" in repr_str
-        assert "connected" in repr_str
+        assert f"status='{expected}'" in repr_str
         connector.close()